@@ -7,12 +7,21 @@ Architecture: Frontend (Streamlit) → Backend API (FastAPI) → ML Model (Rando
 
 import streamlit as st
 import requests
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import json
+from collections import deque
+import unicodedata
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to requests' stdlib json
+    orjson = None
+
 # ══════════════════════════════════════════════════════════
 # PAGE CONFIG
 # ══════════════════════════════════════════════════════════
@@ -25,6 +34,7 @@ st.set_page_config(
 )
 
 BACKEND_URL = "http://localhost:8000"
+REFRESH_SECONDS = 600   # matches the Open-Meteo cache TTL
 
 # ══════════════════════════════════════════════════════════
 # CUSTOM CSS
@@ -152,6 +162,45 @@ WMO_CODES = {
     95:("Thunderstorm","⛈️"), 96:("Thunderstorm+Hail","⛈️"), 99:("Severe Storm","⛈️"),
 }
 
+# Dense code-indexed copies of WMO_CODES (codes are 0–99) for direct and vectorised lookup.
+# Slot 100 is the "Unknown" sentinel that wmo_slot() sends invalid codes to.
+WMO_UNKNOWN_SLOT = 100
+WMO_DESC = np.full(WMO_UNKNOWN_SLOT + 1, "Unknown", dtype=object)
+WMO_ICON = np.full(WMO_UNKNOWN_SLOT + 1, "❓", dtype=object)
+for _code, (_desc, _icon) in WMO_CODES.items():
+    WMO_DESC[_code], WMO_ICON[_code] = _desc, _icon
+
+
+def wmo_slot(code):
+    # Backend responses aren't validated: accept integral numbers (3 or 3.0), send anything
+    # else — None, negatives, fractions, codes >= 100 — to the Unknown slot.
+    try:
+        code = float(code)
+    except (TypeError, ValueError):
+        return WMO_UNKNOWN_SLOT
+    return int(code) if code.is_integer() and 0 <= code < WMO_UNKNOWN_SLOT else WMO_UNKNOWN_SLOT
+
+
+def wmo_slots(codes):
+    # Array version of wmo_slot for the daily codes; None becomes NaN and fails every check.
+    codes = np.asarray(codes, dtype=float)
+    valid = (codes >= 0) & (codes < WMO_UNKNOWN_SLOT) & (codes == np.floor(codes))
+    return np.where(valid, codes, WMO_UNKNOWN_SLOT).astype(int)
+
+# Condition categories as bit flags, so recommendations test the weather code
+# with one dict lookup instead of substring-matching the description.
+CLEAR, CLOUDY, FOG, DRIZZLE, RAIN, SNOW, STORM = (1 << i for i in range(7))
+WMO_CATEGORY = {
+    0: CLEAR, 1: CLEAR | CLOUDY, 2: CLOUDY, 3: CLOUDY, 45: FOG, 48: FOG,
+    51: DRIZZLE, 53: DRIZZLE, 55: DRIZZLE, 61: RAIN, 63: RAIN, 65: RAIN,
+    71: SNOW, 73: SNOW, 75: SNOW, 80: RAIN, 81: RAIN, 82: RAIN,
+    95: STORM, 96: STORM, 99: STORM,
+}
+
+HOURLY_FIELDS = {"Temperature": "temperature_2m",
+                 "Rain Chance (%)": "precipitation_probability",
+                 "Humidity": "relative_humidity_2m"}
+
 # FIX: CHART_BASE no longer includes 'margin' — each chart passes its own margin
 # to avoid Python's "duplicate keyword argument" TypeError.
 CHART_BASE = dict(
@@ -160,24 +209,58 @@ CHART_BASE = dict(
 )
 
 
+# Upper bounds (inclusive) of each US AQI band; bisect_left picks the matching row below.
+AQI_THRESHOLDS = (50, 100, 150, 200, 300)
+AQI_LEVELS = (
+    ("Good",                           "#00b894", "🟢"),
+    ("Moderate",                       "#fdcb6e", "🟡"),
+    ("Unhealthy for Sensitive Groups", "#e17055", "🟠"),
+    ("Unhealthy",                      "#d63031", "🔴"),
+    ("Very Unhealthy",                 "#6c5ce7", "🟣"),
+    ("Hazardous",                      "#2d3436", "⚫"),
+)
+AQI_UNAVAILABLE = ("Unavailable", "#636e72", "❔")
+
+# Same layout for the temperature-driven (wear, activity) tips: bands are (−∞,5], (5,15], … (35,∞).
+TEMP_TIP_THRESHOLDS = (5, 15, 25, 35)
+TEMP_TIPS = (
+    ("Full winter gear: heavy coat, thermals, gloves, warm hat, and layered socks.",
+     "Minimise time outdoors. Stay warm and safe."),
+    ("Warm coat, scarf, and thermal underlayers for extended outdoor time.",
+     "Brisk walks are still fine. Limit extended outdoor exposure."),
+    ("Comfortable casuals with a light jacket ready for the cooler evening.",
+     "Good conditions for outdoor walks, sports, or alfresco dining."),
+    ("Light cotton or linen. A T-shirt and shorts or light trousers will be very comfortable.",
+     "Perfect for picnics, cycling, jogging, or any outdoor sport. Enjoy the weather!"),
+    ("Light, breathable clothing in pale colors. Wide-brimmed hat and sunglasses strongly recommended.",
+     "Avoid strenuous outdoor activity between 11am–4pm. Morning/evening walks or swimming are ideal."),
+)
+
+
 def get_aqi_info(aqi):
-    if aqi <= 50:    return "Good",                           "#00b894", "🟢"
-    elif aqi <= 100: return "Moderate",                       "#fdcb6e", "🟡"
-    elif aqi <= 150: return "Unhealthy for Sensitive Groups", "#e17055", "🟠"
-    elif aqi <= 200: return "Unhealthy",                      "#d63031", "🔴"
-    elif aqi <= 300: return "Very Unhealthy",                 "#6c5ce7", "🟣"
-    else:            return "Hazardous",                      "#2d3436", "⚫"
+    if aqi is None:
+        return AQI_UNAVAILABLE
+    return AQI_LEVELS[bisect_left(AQI_THRESHOLDS, aqi)]
+
+
+def to_celsius(temp, unit):
+    return temp if unit == "metric" else (temp - 32) * 5 / 9
+
+
+def normalize_conditions(weather_code, temp, unit):
+    # Recommendation thresholds are in °C; convert once and share with every recommender.
+    return to_celsius(temp, unit), WMO_CATEGORY.get(weather_code, 0)
 
 
-def rule_based_severity(weather_code, temp, aqi, rain_chance, wind_speed):
+def rule_based_severity(weather_code, temp_c, aqi, rain_chance, wind_speed):
     labels = ["safe and pleasant","mild caution advised","severe weather warning","extreme danger"]
     s = [0.0, 0.0, 0.0, 0.0]
-    if weather_code in (99,) or temp > 42 or aqi > 300 or wind_speed > 90:
+    if weather_code in (99,) or temp_c > 42 or aqi > 300 or wind_speed > 90:
         s[3]=0.80; s[2]=0.12; s[1]=0.05; s[0]=0.03
-    elif weather_code in (95,96) or temp > 38 or aqi > 200 or rain_chance > 85 or wind_speed > 60:
+    elif weather_code in (95,96) or temp_c > 38 or aqi > 200 or rain_chance > 85 or wind_speed > 60:
         s[2]=0.75; s[1]=0.15; s[3]=0.06; s[0]=0.04
     elif (weather_code in (61,63,65,71,73,75,80,81,82)
-          or temp > 32 or aqi > 100 or rain_chance > 50 or wind_speed > 35):
+          or temp_c > 32 or aqi > 100 or rain_chance > 50 or wind_speed > 35):
         s[1]=0.72; s[0]=0.18; s[2]=0.07; s[3]=0.03
     else:
         s[0]=0.82; s[1]=0.12; s[2]=0.04; s[3]=0.02
@@ -185,7 +268,9 @@ def rule_based_severity(weather_code, temp, aqi, rain_chance, wind_speed):
     return {"label": labels[best], "score": s[best], "all": list(zip(labels, s))}
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def check_backend():
+    # Probed on every rerun otherwise; a short TTL still notices the backend coming up or going down.
     try:
         r = requests.get(f"{BACKEND_URL}/", timeout=3)
         return r.status_code == 200, r.json()
@@ -195,8 +280,8 @@ def check_backend():
 
 def fetch_weather_via_backend(city, units):
     try:
-        r = requests.post(f"{BACKEND_URL}/weather-data",
-                          json={"city": city, "units": units}, timeout=15)
+        r = SESSION.post(f"{BACKEND_URL}/weather-data",
+                         json={"city": city, "units": units}, timeout=15)
         if r.status_code == 200:
             return r.json(), True
     except Exception:
@@ -204,58 +289,135 @@ def fetch_weather_via_backend(city, units):
     return None, False
 
 
-def fetch_weather_direct(city, units):
+def clean_city(city):
+    # NFKC folds look-alike Unicode forms so "São Paulo" variants share one geocode cache entry.
+    city = unicodedata.normalize("NFKC", city or "").strip()
+    return city if 0 < len(city) <= 100 else None
+
+
+def parse_json(response):
+    return orjson.loads(response.content) if orjson else response.json()
+
+
+@st.cache_resource
+def get_http_session():
+    # Streamlit re-executes this script on every interaction, so the pooled session
+    # lives in cache_resource to keep TLS connections alive across reruns.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4, pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("https://", adapter)
+    # Local FastAPI backend: pooled but never retried, so a backend that went down since the
+    # cached health check fails fast and the app falls back to Open-Meteo straight away.
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+    return session
+
+
+SESSION = get_http_session()
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def geocode(city):
+    # Keyed on the normalised name so "Delhi", "delhi " and a quick-city click share one entry.
+    r = SESSION.get("https://geocoding-api.open-meteo.com/v1/search",
+                    params={"name": city, "count": 1}, timeout=10)
+    r.raise_for_status()   # raise instead of caching a 429/5xx body as "city not found"
+    geo = parse_json(r)
+    results = geo.get("results") or []
+    return results[0] if results else None
+
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+
+def forecast_params(lat, lon, tz, units, **extra):
+    # Shared by every forecast request so location, units and horizon can't drift apart.
+    return {"latitude": lat, "longitude": lon, "timezone": tz, "forecast_days": 10,
+            "temperature_unit": "celsius" if units == "metric" else "fahrenheit",
+            "wind_speed_unit":  "kmh"     if units == "metric" else "mph",
+            **extra}
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_forecast(lat, lon, tz, units, hourly_field="temperature_2m"):
+    r = SESSION.get(FORECAST_URL, params=forecast_params(
+        lat, lon, tz, units,
+        current="temperature_2m,relative_humidity_2m,precipitation,weather_code,wind_speed_10m",
+        daily="weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max",
+        hourly=hourly_field,
+    ), timeout=10)
+    r.raise_for_status()   # an {"error": true, "reason": ...} body must not be cached as a forecast
+    data = parse_json(r)
+    # Stamped inside the cached call, so a payload reused from st.cache_data keeps its real age.
+    data["fetched_at"] = datetime.now()
+    return data
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_hourly_series(lat, lon, tz, units, hourly_field):
+    # Used when the plot selector switches to a series the stored forecast doesn't have yet.
+    r = SESSION.get(FORECAST_URL, params=forecast_params(lat, lon, tz, units, hourly=hourly_field),
+                    timeout=10)
+    r.raise_for_status()
+    return parse_json(r)["hourly"]
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_aqi(lat, lon):
+    r = SESSION.get("https://air-quality-api.open-meteo.com/v1/air-quality",
+                    params={"latitude": lat, "longitude": lon, "current": "us_aqi"}, timeout=10)
+    r.raise_for_status()
+    return parse_json(r)
+
+
+def fetch_weather_direct(city, units, hourly_field="temperature_2m"):
     try:
-        geo = requests.get("https://geocoding-api.open-meteo.com/v1/search",
-                           params={"name": city, "count": 1}, timeout=10).json()
-        if "results" not in geo or not geo["results"]:
+        loc = geocode(city.lower())
+        if not loc:
             st.error(f"❌ City not found: **{city}**")
             return None, None, None
-        loc = geo["results"][0]
         lat, lon, tz = loc["latitude"], loc["longitude"], loc["timezone"]
-        unit_temp = "celsius" if units == "metric" else "fahrenheit"
-        unit_wind = "kmh"     if units == "metric" else "mph"
-        w = requests.get("https://api.open-meteo.com/v1/forecast", params={
-            "latitude": lat, "longitude": lon, "timezone": tz,
-            "current": "temperature_2m,relative_humidity_2m,precipitation,weather_code,wind_speed_10m",
-            "daily":   "weather_code,temperature_2m_max,temperature_2m_min,precipitation_probability_max",
-            "hourly":  "temperature_2m,precipitation_probability,relative_humidity_2m",
-            "temperature_unit": unit_temp, "wind_speed_unit": unit_wind, "forecast_days": 10
-        }, timeout=10).json()
-        a = requests.get("https://air-quality-api.open-meteo.com/v1/air-quality",
-                         params={"latitude": lat, "longitude": lon, "current": "us_aqi"},
-                         timeout=10).json()
-        return w, a, loc
     except Exception as e:
         st.error(f"API Error: {e}")
         return None, None, None
 
-
-def process_forecast(daily):
-    df = pd.DataFrame(daily)
-    df["date"] = pd.to_datetime(df["time"])
-    df["day"]  = df["date"].dt.strftime("%a, %b %d")
-    return df
+    # Forecast and AQI only depend on the coordinates — fetch them side by side.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        w_future = pool.submit(fetch_forecast, lat, lon, tz, units, hourly_field)
+        a_future = pool.submit(fetch_aqi, lat, lon)
+    try:
+        w = w_future.result()
+    except Exception as e:
+        st.error(f"API Error: {e}")
+        return None, None, None
+    # A failed AQI call shouldn't throw away a good forecast — the tabs render AQI as unavailable.
+    try:
+        a = a_future.result()
+    except Exception as e:
+        st.warning(f"Air quality data unavailable: {e}")
+        a = None
+    return w, a, loc
 
 
-def process_hourly(hourly):
-    df = pd.DataFrame(hourly)
-    df["Timestamp"] = pd.to_datetime(df["time"])
-    df.rename(columns={"temperature_2m": "Temperature",
-                        "relative_humidity_2m": "Humidity",
-                        "precipitation_probability": "Rain Chance (%)"}, inplace=True)
-    return df.set_index("Timestamp")
+def forecast_days(daily):
+    # Ten rows don't justify a DataFrame — read the API's parallel lists directly.
+    return [datetime.fromisoformat(t).strftime("%a, %b %d") for t in daily["time"]]
 
 
-def smart_summary(condition, temp, humidity, rain_chance, wind, wind_unit, aqi, city, unit_symbol):
-    feel = ("hot and humid"        if temp > 32 and humidity > 70 else
-            "warm and pleasant"    if temp > 25 else
-            "cool and comfortable" if temp > 15 else
-            "cold"                 if temp > 5  else "freezing")
+@st.cache_data(max_entries=128, show_spinner=False)
+def smart_summary(condition, temp, temp_c, humidity, rain_chance, wind, wind_unit, aqi, city, unit_symbol):
+    # temp is shown in the user's unit; the feel thresholds use the normalised °C value.
+    feel = ("hot and humid"        if temp_c > 32 and humidity > 70 else
+            "warm and pleasant"    if temp_c > 25 else
+            "cool and comfortable" if temp_c > 15 else
+            "cold"                 if temp_c > 5  else "freezing")
     rain_desc = ("high chance of rain — carry an umbrella" if rain_chance > 60 else
                  "possible showers later" if rain_chance > 30 else "mostly dry and clear")
     aqi_label, _, _ = get_aqi_info(aqi)
-    aqi_note = (f" Air quality is {aqi_label.lower()} — limit prolonged outdoor exposure." if aqi > 150
+    aqi_note = ("" if aqi is None else
+                f" Air quality is {aqi_label.lower()} — limit prolonged outdoor exposure." if aqi > 150
                 else f" Air quality is {aqi_label.lower()}.")
     return (
         f"{city} is currently experiencing <strong>{condition.lower()}</strong> conditions "
@@ -265,64 +427,55 @@ def smart_summary(condition, temp, humidity, rain_chance, wind, wind_unit, aqi,
     )
 
 
-def smart_tips(condition, temp, aqi, rain_chance):
-    cond = condition.lower()
-    if "storm" in cond or "thunder" in cond:
+@st.cache_data(max_entries=128, show_spinner=False)
+def smart_tips(temp_c, cat, aqi, rain_chance):
+    if cat & STORM:
         wear     = "Stay indoors if possible. Heavy waterproof gear essential if going out. Avoid tall trees and metal objects."
         activity = "Avoid all outdoor activities. Great day for movies, reading, or productive indoor work."
-    elif "rain" in cond or "drizzle" in cond or "shower" in cond:
+    elif cat & (RAIN | DRIZZLE):
         wear     = "Waterproof jacket and umbrella are a must. Water-resistant footwear strongly recommended."
         activity = "Outdoor plans may be disrupted. Consider a café, museum, or indoor workout instead."
-    elif "snow" in cond:
+    elif cat & SNOW:
         wear     = "Heavy thermal coat, waterproof boots, gloves, and a warm hat are all essential."
         activity = "Snow sports are great if you enjoy them — otherwise cozy up indoors with a warm drink."
-    elif temp > 35:
-        wear     = "Light, breathable clothing in pale colors. Wide-brimmed hat and sunglasses strongly recommended."
-        activity = "Avoid strenuous outdoor activity between 11am–4pm. Morning/evening walks or swimming are ideal."
-    elif temp > 25:
-        wear     = "Light cotton or linen. A T-shirt and shorts or light trousers will be very comfortable."
-        activity = "Perfect for picnics, cycling, jogging, or any outdoor sport. Enjoy the weather!"
-    elif temp > 15:
-        wear     = "Comfortable casuals with a light jacket ready for the cooler evening."
-        activity = "Good conditions for outdoor walks, sports, or alfresco dining."
-    elif temp > 5:
-        wear     = "Warm coat, scarf, and thermal underlayers for extended outdoor time."
-        activity = "Brisk walks are still fine. Limit extended outdoor exposure."
     else:
-        wear     = "Full winter gear: heavy coat, thermals, gloves, warm hat, and layered socks."
-        activity = "Minimise time outdoors. Stay warm and safe."
+        wear, activity = TEMP_TIPS[bisect_left(TEMP_TIP_THRESHOLDS, temp_c)]
 
     health = []
-    if aqi > 200:    health.append("⚠️ Very unhealthy air — wear an N95 mask outdoors and keep windows closed.")
+    if aqi is None:  health.append("ℹ️ Air quality data is unavailable right now.")
+    elif aqi > 200:  health.append("⚠️ Very unhealthy air — wear an N95 mask outdoors and keep windows closed.")
     elif aqi > 150:  health.append("⚠️ Unhealthy air — sensitive groups should stay inside.")
     elif aqi > 100:  health.append("ℹ️ Moderate air — children and elderly should limit prolonged outdoor exposure.")
     else:            health.append("✅ Air quality is acceptable for most people today.")
-    if temp > 35:    health.append("💧 Drink at least 3–4 litres of water to prevent heat exhaustion.")
+    if temp_c > 35:  health.append("💧 Drink at least 3–4 litres of water to prevent heat exhaustion.")
     if rain_chance > 50: health.append("🥾 Wet conditions — wear non-slip footwear.")
     return wear, activity, " ".join(health)
 
 
-def analyze_patterns(daily_df, unit_symbol):
-    hi   = daily_df["temperature_2m_max"].tolist()
-    lo   = daily_df["temperature_2m_min"].tolist()
-    rain = daily_df["precipitation_probability_max"].tolist()
+def analyze_patterns(daily, unit_symbol, unit):
+    hi   = daily["temperature_2m_max"]
+    lo   = daily["temperature_2m_min"]
+    rain = daily["precipitation_probability_max"]
     avg_max    = sum(hi)   / len(hi)
     avg_min    = sum(lo)   / len(lo)
     avg_rain   = sum(rain) / len(rain)
     max_temp   = max(hi);   min_temp = min(lo)
     rainy_days = sum(1 for r in rain if r > 50)
     temp_swing = max_temp - min_temp
+    # Reported values stay in the display unit; the insight thresholds below are in °C.
+    max_c, min_c = to_celsius(max_temp, unit), to_celsius(min_temp, unit)
+    swing_c    = max_c - min_c
     insights   = []
     if avg_rain > 60:   insights.append(("🌧️","High Rainfall Week","Persistent rain expected — keep an umbrella all week."))
     elif avg_rain > 30: insights.append(("🌦️","Occasional Showers","Intermittent rain possible — check forecasts before heading out."))
     else:               insights.append(("☀️","Mostly Dry Week","Great week for outdoor plans with minimal rain expected."))
-    if temp_swing > 12: insights.append(("🌡️","Large Temperature Swing",f"A {temp_swing:.0f}{unit_symbol} variation this week — dress in layers."))
-    elif temp_swing > 6: insights.append(("🌡️","Moderate Temp Change",f"Expect a {temp_swing:.0f}{unit_symbol} variation — light layers recommended."))
+    if swing_c > 12:    insights.append(("🌡️","Large Temperature Swing",f"A {temp_swing:.0f}{unit_symbol} variation this week — dress in layers."))
+    elif swing_c > 6:   insights.append(("🌡️","Moderate Temp Change",f"Expect a {temp_swing:.0f}{unit_symbol} variation — light layers recommended."))
     else:               insights.append(("🌡️","Stable Temperatures","Consistent temperatures throughout the week."))
-    if max_temp > 38:   insights.append(("🔥","Extreme Heat Warning","Dangerous heat expected — stay indoors and hydrate frequently."))
-    elif max_temp > 32: insights.append(("☀️","Hot Days Ahead","Stay hydrated and wear sunscreen on warm days."))
-    if min_temp < 2:    insights.append(("🧊","Near-Freezing Nights","Protect exposed pipes and wear heavy winter clothing in evenings."))
-    elif min_temp < 10: insights.append(("🥶","Cool Nights","Cold nights ahead — keep warm clothing ready after sunset."))
+    if max_c > 38:      insights.append(("🔥","Extreme Heat Warning","Dangerous heat expected — stay indoors and hydrate frequently."))
+    elif max_c > 32:    insights.append(("☀️","Hot Days Ahead","Stay hydrated and wear sunscreen on warm days."))
+    if min_c < 2:       insights.append(("🧊","Near-Freezing Nights","Protect exposed pipes and wear heavy winter clothing in evenings."))
+    elif min_c < 10:    insights.append(("🥶","Cool Nights","Cold nights ahead — keep warm clothing ready after sunset."))
     if (10 - rainy_days) >= 8: insights.append(("🌈","Excellent Outdoor Week",f"{10-rainy_days} dry days forecast — perfect for travel and outdoor activities."))
     elif rainy_days >= 7: insights.append(("☔","Very Rainy Week",f"Rain expected on {rainy_days}/10 days — plan indoor alternatives."))
     return {"avg_max": avg_max, "avg_min": avg_min, "avg_rain": avg_rain,
@@ -330,6 +483,29 @@ def analyze_patterns(daily_df, unit_symbol):
             "rainy_days": rainy_days, "temp_swing": temp_swing, "insights": insights}
 
 
+@st.cache_data(ttl=600, max_entries=64, show_spinner=False)
+def build_hourly_figure(hourly_json, plot_choice):
+    # Takes the time axis and one series as a JSON string (cheap to hash) and returns the figure as a
+    # plain dict, so tab switches reuse the cached chart instead of re-running Plotly Express.
+    import plotly.express as px
+
+    hourly = json.loads(hourly_json)
+    cmap   = {"Temperature":"#ff7675","Rain Chance (%)":"#74b9ff","Humidity":"#55efc4"}
+    # Open-Meteo always sends "YYYY-MM-DDTHH:MM", so parse straight to minute precision
+    # rather than leaving Plotly to infer the format from strings.
+    timestamps = np.array(hourly["time"], dtype="datetime64[m]")
+    fig = px.area(x=timestamps, y=hourly[HOURLY_FIELDS[plot_choice]],
+                  labels={"x": "Timestamp", "y": plot_choice},
+                  color_discrete_sequence=[cmap[plot_choice]])
+    fig.update_traces(opacity=0.78, line=dict(width=2))
+    fig.update_layout(**CHART_BASE, height=300, showlegend=False,
+                      margin=dict(l=0, r=0, t=20, b=0),
+                      xaxis=dict(showgrid=False, color="#636e72", title=""),
+                      yaxis=dict(showgrid=True, gridcolor="rgba(255,255,255,0.05)",
+                                 color="#636e72", title=plot_choice))
+    return fig.to_dict()
+
+
 # ══════════════════════════════════════════════════════════
 # SIDEBAR
 # ══════════════════════════════════════════════════════════
@@ -364,7 +540,7 @@ with st.sidebar:
 
     st.markdown("<p style='color:#636e72; font-size:0.72em; font-weight:700; text-transform:uppercase; letter-spacing:1.5px; margin:16px 0 8px 0;'>📌 Quick Cities</p>", unsafe_allow_html=True)
     if "saved_cities" not in st.session_state:
-        st.session_state.saved_cities = ["Delhi","Mumbai","London","New York","Tokyo"]
+        st.session_state.saved_cities = deque(["Delhi","Mumbai","London","New York","Tokyo"], maxlen=8)
 
     cols_c = st.columns(2)
     for idx, sc in enumerate(st.session_state.saved_cities):
@@ -426,9 +602,24 @@ st.markdown(f"""
 weather_data = air_data = location = ml_prediction = None
 using_backend = False
 
-if st.session_state.city:
+# Widget interactions (tabs, plot selector) rerun the whole script; only hit the
+# network when the city or units changed, or the stored data is older than REFRESH_SECONDS.
+query = clean_city(st.session_state.city)
+if not query:
+    st.error("Please enter a valid city name.")
+
+# Only the hourly series shown in the Forecast tab is requested from Open-Meteo.
+hourly_field = HOURLY_FIELDS[st.session_state.get("plot_choice", "Temperature")]
+
+fetch_key   = (query, selected_unit)
+needs_fetch = bool(query) and not (
+    st.session_state.get("last_fetch_key") == fetch_key and "weather_data" in st.session_state
+    and (datetime.now() - st.session_state.get("fetched_at", datetime.min)).total_seconds() < REFRESH_SECONDS
+)
+
+if needs_fetch:
     if backend_ok:
-        result, ok = fetch_weather_via_backend(st.session_state.city, selected_unit)
+        result, ok = fetch_weather_via_backend(query, selected_unit)
         if ok and result:
             location     = result["location"]
             air_data     = {"current": result["air_quality"]}
@@ -439,22 +630,34 @@ if st.session_state.city:
             using_backend = True
 
     if not using_backend:
-        weather_data, air_data, location = fetch_weather_direct(
-            st.session_state.city, selected_unit
-        )
+        weather_data, air_data, location = fetch_weather_direct(query, selected_unit, hourly_field)
 
-    if weather_data and air_data and location:
+    if weather_data and location:
         st.session_state.weather_data  = weather_data
         st.session_state.air_data      = air_data
         st.session_state.unit_symbol   = unit_symbol
         st.session_state.selected_unit = selected_unit
         st.session_state.location      = location
         st.session_state.ml_prediction = ml_prediction
+        st.session_state.last_fetch_key = fetch_key
+        st.session_state.fetched_at     = weather_data.get("fetched_at", datetime.now())
         city_name = location["name"]
         if city_name not in st.session_state.saved_cities:
-            if len(st.session_state.saved_cities) >= 8:
-                st.session_state.saved_cities.pop(0)
-            st.session_state.saved_cities.append(city_name)
+            st.session_state.saved_cities.append(city_name)  # deque drops the oldest past 8
+
+elif query and hourly_field not in st.session_state.weather_data["hourly"]:
+    # Plot switched to a series we haven't downloaded: fetch only that series and merge it
+    # into the stored hourly block, keeping current/daily data as they are.
+    stored_hourly = st.session_state.weather_data["hourly"]
+    loc = st.session_state.location
+    try:
+        series = fetch_hourly_series(loc["latitude"], loc["longitude"], loc["timezone"],
+                                     st.session_state.selected_unit, hourly_field)
+        if series["time"] != stored_hourly["time"]:   # day rolled over since the last fetch
+            stored_hourly.clear()
+        stored_hourly.update(series)
+    except Exception as e:
+        st.warning(f"Hourly data unavailable: {e}")
 
 
 # ══════════════════════════════════════════════════════════
@@ -491,6 +694,12 @@ if "weather_data" not in st.session_state:
     """, unsafe_allow_html=True)
 
 else:
+    # Charting libraries are only needed once there is data to show, so the first
+    # (welcome-screen) run doesn't pay for importing pandas and Plotly.
+    import pandas as pd
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     # ── UNPACK ──
     weather_data  = st.session_state.weather_data
     air_data      = st.session_state.air_data
@@ -500,19 +709,25 @@ else:
     ml_prediction = st.session_state.get("ml_prediction")
 
     current    = weather_data["current"]
-    daily_df   = process_forecast(weather_data["daily"])
-    hourly_df  = process_hourly(weather_data["hourly"])
-    aqi        = air_data["current"]["us_aqi"]
+    daily      = weather_data["daily"]
+    days       = forecast_days(daily)
+    day_codes  = wmo_slots(daily["weather_code"])
+    day_descs, day_icons = WMO_DESC[day_codes], WMO_ICON[day_codes]
+    aqi        = ((air_data or {}).get("current") or {}).get("us_aqi")
+    aqi_score  = aqi if aqi is not None else 0   # missing AQI contributes nothing to the rule thresholds
+    aqi_text   = aqi if aqi is not None else "—"
     aqi_label, aqi_color, aqi_emoji = get_aqi_info(aqi)
-    desc, icon = WMO_CODES.get(current["weather_code"], ("Unknown","❓"))
+    code_slot  = wmo_slot(current["weather_code"])
+    desc, icon = WMO_DESC[code_slot], WMO_ICON[code_slot]
     wind_label = "km/h" if selected_unit == "metric" else "mph"
-    rain_today = daily_df.iloc[0]["precipitation_probability_max"]
+    temp_c, condition_cat = normalize_conditions(current["weather_code"], current["temperature_2m"], selected_unit)
+    rain_today = daily["precipitation_probability_max"][0]
     country    = location.get("country","")
 
     st.markdown(
         f"<p style='color:#74b9ff; margin:0 0 16px 0; font-size:0.88em; font-weight:600;'>"
         f"📍 {location['name']}{', '+country if country else ''}"
-        f" &nbsp;·&nbsp; Updated {datetime.now().strftime('%H:%M')}</p>",
+        f" &nbsp;·&nbsp; Updated {st.session_state.get('fetched_at', datetime.now()).strftime('%H:%M')}</p>",
         unsafe_allow_html=True
     )
 
@@ -534,9 +749,9 @@ else:
                 <p class='temp-display'>{current['temperature_2m']:.0f}{unit_symbol}</p>
                 <p style='font-size:1.5em; margin:10px 0 6px 0; font-weight:600;'>{icon} {desc}</p>
                 <p style='color:#636e72; margin:0; font-size:0.88em;'>
-                    ↑ <strong style='color:#ff7675;'>{daily_df.iloc[0]['temperature_2m_max']:.0f}{unit_symbol}</strong>
+                    ↑ <strong style='color:#ff7675;'>{daily['temperature_2m_max'][0]:.0f}{unit_symbol}</strong>
                     &nbsp;&nbsp;
-                    ↓ <strong style='color:#74b9ff;'>{daily_df.iloc[0]['temperature_2m_min']:.0f}{unit_symbol}</strong>
+                    ↓ <strong style='color:#74b9ff;'>{daily['temperature_2m_min'][0]:.0f}{unit_symbol}</strong>
                 </p>
             </div>""", unsafe_allow_html=True)
 
@@ -572,34 +787,34 @@ else:
                 <div style='flex:1;'>
                     <p style='font-size:1.7em; font-weight:800; color:{aqi_color}; margin:0 0 4px 0;'>{aqi_label}</p>
                     <p style='color:#636e72; margin:0; font-size:0.85em;'>
-                        US AQI: <strong style='color:#dfe6e9;'>{aqi}</strong>
+                        US AQI: <strong style='color:#dfe6e9;'>{aqi_text}</strong>
                         &nbsp;·&nbsp; 0–50 Good · 51–100 Moderate · 101–150 Sensitive · 151+ Unhealthy
                     </p>
                 </div>
                 <div style='text-align:right; min-width:160px;'>
                     <div style='background:rgba(255,255,255,0.05); border-radius:8px; height:8px; overflow:hidden;'>
-                        <div style='background:{aqi_color}; width:{min(aqi/300*100,100):.0f}%; height:100%; border-radius:8px;'></div>
+                        <div style='background:{aqi_color}; width:{min(aqi_score/300*100,100):.0f}%; height:100%; border-radius:8px;'></div>
                     </div>
-                    <p style='color:#636e72; font-size:0.75em; margin:4px 0 0 0;'>{aqi} / 300</p>
+                    <p style='color:#636e72; font-size:0.75em; margin:4px 0 0 0;'>{aqi_text} / 300</p>
                 </div>
             </div>
         </div>""", unsafe_allow_html=True)
 
         st.markdown("<p class='section-header'>📆 3-Day Outlook</p>", unsafe_allow_html=True)
         d_cols = st.columns(3, gap="small")
-        for i, (_, row) in enumerate(daily_df.head(3).iterrows()):
-            d, ic = WMO_CODES.get(row["weather_code"], ("Unknown","❓"))
-            rp = row["precipitation_probability_max"]
-            with d_cols[i]:
+        outlook = zip(d_cols, days, day_descs, day_icons, daily["temperature_2m_max"],
+                      daily["temperature_2m_min"], daily["precipitation_probability_max"])
+        for col, day, d, ic, tmax, tmin, rp in outlook:
+            with col:
                 st.markdown(f"""
                 <div class='metric-card' style='text-align:center; padding:20px 16px;'>
-                    <p style='color:#74b9ff; font-size:0.78em; font-weight:700; margin:0;'>{row['day']}</p>
+                    <p style='color:#74b9ff; font-size:0.78em; font-weight:700; margin:0;'>{day}</p>
                     <p style='font-size:2.2em; margin:8px 0 4px 0;'>{ic}</p>
                     <p style='font-size:0.82em; margin:0 0 8px 0; color:#b2bec3;'>{d}</p>
                     <p style='margin:0 0 8px 0;'>
-                        <span style='color:#ff7675; font-weight:700;'>{row['temperature_2m_max']:.0f}{unit_symbol}</span>
+                        <span style='color:#ff7675; font-weight:700;'>{tmax:.0f}{unit_symbol}</span>
                         <span style='color:#4a5568;'> / </span>
-                        <span style='color:#74b9ff; font-weight:700;'>{row['temperature_2m_min']:.0f}{unit_symbol}</span>
+                        <span style='color:#74b9ff; font-weight:700;'>{tmin:.0f}{unit_symbol}</span>
                     </p>
                     <div style='background:rgba(116,185,255,0.1); border-radius:6px; height:5px; overflow:hidden;'>
                         <div style='background:#74b9ff; width:{int(rp)}%; height:100%; border-radius:6px;'></div>
@@ -612,20 +827,21 @@ else:
     # ══════════════════════════════════════════════════════════
     with tab2:
         st.markdown("<p class='section-header'>📅 10-Day Daily Forecast</p>", unsafe_allow_html=True)
-        for _, row in daily_df.iterrows():
-            d, ic  = WMO_CODES.get(row["weather_code"], ("Unknown","❓"))
-            rain   = row["precipitation_probability_max"]
+        # One markdown call for the whole list instead of one Streamlit message per day.
+        rows = []
+        for day, d, ic, tmax, tmin, rain in zip(days, day_descs, day_icons, daily["temperature_2m_max"],
+                                                daily["temperature_2m_min"], daily["precipitation_probability_max"]):
             rcolor = "#ff7675" if rain > 70 else "#fdcb6e" if rain > 40 else "#74b9ff"
-            st.markdown(f"""
+            rows.append(f"""
             <div class='forecast-row'>
                 <div style='display:flex; align-items:center; gap:16px;'>
-                    <div style='width:116px; color:#b2bec3; font-size:0.88em; font-weight:500;'>{row['day']}</div>
+                    <div style='width:116px; color:#b2bec3; font-size:0.88em; font-weight:500;'>{day}</div>
                     <div style='width:32px; font-size:1.3em; text-align:center;'>{ic}</div>
                     <div style='flex:1; color:#dfe6e9; font-size:0.86em;'>{d}</div>
                     <div style='width:90px; text-align:right; font-size:0.9em;'>
-                        <span style='color:#ff7675; font-weight:700;'>{row['temperature_2m_max']:.0f}{unit_symbol}</span>
+                        <span style='color:#ff7675; font-weight:700;'>{tmax:.0f}{unit_symbol}</span>
                         <span style='color:#4a5568;'> / </span>
-                        <span style='color:#74b9ff; font-weight:700;'>{row['temperature_2m_min']:.0f}{unit_symbol}</span>
+                        <span style='color:#74b9ff; font-weight:700;'>{tmin:.0f}{unit_symbol}</span>
                     </div>
                     <div style='width:110px;'>
                         <div style='background:rgba(255,255,255,0.05); border-radius:4px; height:6px; overflow:hidden;'>
@@ -634,22 +850,21 @@ else:
                         <p style='color:#636e72; font-size:0.73em; margin:3px 0 0 0; text-align:right;'>💧 {rain}%</p>
                     </div>
                 </div>
-            </div>""", unsafe_allow_html=True)
+            </div>""")
+        st.markdown(f"<div>{''.join(rows)}</div>", unsafe_allow_html=True)
 
         st.markdown("<br><p class='section-header'>📈 Hourly Trends</p>", unsafe_allow_html=True)
         hc1, hc2 = st.columns([1, 3])
         with hc1:
-            plot_choice = st.selectbox("", ["Temperature","Rain Chance (%)","Humidity"], label_visibility="collapsed")
-        cmap  = {"Temperature":"#ff7675","Rain Chance (%)":"#74b9ff","Humidity":"#55efc4"}
-        hr    = hourly_df.reset_index()
-        fig_h = px.area(hr, x="Timestamp", y=plot_choice, color_discrete_sequence=[cmap[plot_choice]])
-        fig_h.update_traces(opacity=0.78, line=dict(width=2))
-        fig_h.update_layout(**CHART_BASE, height=300, showlegend=False,
-                            margin=dict(l=0, r=0, t=20, b=0),
-                            xaxis=dict(showgrid=False, color="#636e72", title=""),
-                            yaxis=dict(showgrid=True, gridcolor="rgba(255,255,255,0.05)",
-                                       color="#636e72", title=plot_choice))
-        st.plotly_chart(fig_h, use_container_width=True)
+            plot_choice = st.selectbox("", list(HOURLY_FIELDS), key="plot_choice", label_visibility="collapsed")
+        hourly = weather_data["hourly"]
+        field  = HOURLY_FIELDS[plot_choice]
+        if field in hourly:
+            series_json = json.dumps({"time": hourly["time"], field: hourly[field]})
+            fig_h = go.Figure(build_hourly_figure(series_json, plot_choice))
+            st.plotly_chart(fig_h, use_container_width=True)
+        else:
+            st.info(f"Hourly {plot_choice.lower()} data is unavailable right now — try again shortly.")
 
     # ══════════════════════════════════════════════════════════
     # TAB 3 — AI SUMMARY
@@ -667,7 +882,7 @@ else:
 
         if not st.session_state.get("ai_summary"):
             st.session_state.ai_summary = smart_summary(
-                desc, current["temperature_2m"], current["relative_humidity_2m"],
+                desc, current["temperature_2m"], temp_c, current["relative_humidity_2m"],
                 rain_today, current["wind_speed_10m"], wind_label, aqi, location["name"], unit_symbol
             )
 
@@ -684,8 +899,8 @@ else:
 
         if not st.session_state.get("ai_severity"):
             st.session_state.ai_severity = rule_based_severity(
-                current["weather_code"], current["temperature_2m"],
-                aqi, rain_today, current["wind_speed_10m"]
+                current["weather_code"], temp_c,
+                aqi_score, rain_today, current["wind_speed_10m"]
             )
 
         sev   = st.session_state.ai_severity
@@ -855,7 +1070,7 @@ else:
         st.markdown("<p style='color:#636e72; font-size:0.88em; margin:0 0 16px 0;'>Statistical analysis and AI-generated insights from your 10-day forecast data.</p>", unsafe_allow_html=True)
 
         if not st.session_state.get("ai_analysis"):
-            st.session_state.ai_analysis = analyze_patterns(daily_df, unit_symbol)
+            st.session_state.ai_analysis = analyze_patterns(daily, unit_symbol, selected_unit)
         an = st.session_state.ai_analysis
 
         kpi_cols = st.columns(4, gap="small")
@@ -887,9 +1102,9 @@ else:
         with pc1:
             st.markdown("<p class='section-header'>🌡️ Temperature Range</p>", unsafe_allow_html=True)
             tdf = pd.DataFrame({
-                "Day": list(daily_df["day"]) * 2,
-                "Temperature": list(daily_df["temperature_2m_max"]) + list(daily_df["temperature_2m_min"]),
-                "Type": ["High"] * len(daily_df) + ["Low"] * len(daily_df)
+                "Day": days * 2,
+                "Temperature": daily["temperature_2m_max"] + daily["temperature_2m_min"],
+                "Type": ["High"] * len(days) + ["Low"] * len(days)
             })
             fig_t = px.line(tdf, x="Day", y="Temperature", color="Type",
                             color_discrete_map={"High":"#ff7675","Low":"#74b9ff"}, markers=True)
@@ -906,7 +1121,8 @@ else:
 
         with pc2:
             st.markdown("<p class='section-header'>💧 Rain Probability</p>", unsafe_allow_html=True)
-            rdf = daily_df[["day","precipitation_probability_max"]].copy()
+            rdf = pd.DataFrame({"day": days,
+                                "precipitation_probability_max": daily["precipitation_probability_max"]})
             rdf["Level"] = rdf["precipitation_probability_max"].apply(
                 lambda r: "Low (<40%)" if r < 40 else "Moderate (40–70%)" if r < 70 else "High (>70%)"
             )
@@ -938,7 +1154,7 @@ else:
                 st.rerun()
 
         if not st.session_state.get("ai_tips"):
-            w, act, h = smart_tips(desc, current["temperature_2m"], aqi, rain_today)
+            w, act, h = smart_tips(temp_c, condition_cat, aqi, rain_today)
             st.session_state.ai_tips = (w, act, h)
 
         wear, activity, health = st.session_state.ai_tips
@@ -965,12 +1181,13 @@ else:
 
         st.markdown("<p class='section-header'>⚡ Today at a Glance</p>", unsafe_allow_html=True)
         umbrella = "✅ Recommended"  if rain_today > 40 else "❌ Not needed"
-        outdoor  = ("✅ Great day"   if rain_today < 30 and aqi < 100 and current["temperature_2m"] < 36
-                    else "⚠️ Moderate" if rain_today < 60 and aqi < 150 else "❌ Avoid outdoors")
-        mask     = ("✅ Recommended" if aqi > 150 else "⚠️ Optional" if aqi > 100 else "❌ Not needed")
-        uv       = ("🔴 Very High"   if current["temperature_2m"] > 35 else
-                    "🟠 High"        if current["temperature_2m"] > 28 else
-                    "🟡 Moderate"    if current["temperature_2m"] > 20 else "🟢 Low")
+        outdoor  = ("✅ Great day"   if rain_today < 30 and aqi_score < 100 and temp_c < 36
+                    else "⚠️ Moderate" if rain_today < 60 and aqi_score < 150 else "❌ Avoid outdoors")
+        mask     = ("❔ Unknown"     if aqi is None else
+                    "✅ Recommended" if aqi > 150 else "⚠️ Optional" if aqi > 100 else "❌ Not needed")
+        uv       = ("🔴 Very High"   if temp_c > 35 else
+                    "🟠 High"        if temp_c > 28 else
+                    "🟡 Moderate"    if temp_c > 20 else "🟢 Low")
 
         g_cols = st.columns(4, gap="small")
         for col, (lbl, val) in zip(g_cols, [("☂️ Umbrella?",umbrella),